@@ -1,6 +1,10 @@
+from __future__ import print_function
+
 import json as js
 import os
+import sys
 import time
+from functools import reduce
 
 import requests
 
@@ -10,6 +14,11 @@ from cli.libs import osutils
 from cli.mmt.processing import XMLEncoder
 from cli.translators import GoogleTranslate, MMTTranslator, TranslateError
 
+try:
+    basestring
+except NameError:  # Python 3
+    basestring = str
+
 
 class HumanEvaluationFileOutputter:
     def __init__(self, separator='\t'):
@@ -19,12 +28,12 @@ class HumanEvaluationFileOutputter:
         line_id = 0
 
         with open(output_file, 'wb') as out:
-            with open(input_file) as inp:
+            with open(input_file, 'rb') as inp:
                 for line in inp:
-                    line = line.replace(self.separator, ' ')
+                    line = line.decode('utf-8').replace(self.separator, ' ')
                     lid = str(line_id)
                     line_id += 1
-                    line = self.separator.join([lid, lang, line.decode('utf-8')])
+                    line = self.separator.join([lid, lang, line])
                     out.write(line.encode('utf-8'))
 
 
@@ -71,7 +80,7 @@ class CharCutScore(Score):
 
     def calculate(self, document, reference):
         script = os.path.join(cli.PYOPT_DIR, 'charcut.py')
-        command = ['python', script, '-c', '/dev/stdin', '-r', reference]
+        command = [sys.executable, script, '-c', '/dev/stdin', '-r', reference]
 
         with open(document) as input_stream:
             stdout, _ = osutils.shell_exec(command, stdin=input_stream)
@@ -151,14 +160,14 @@ class _StepLogger:
 
     def __enter__(self):
         message = '%s... ' % self._step
-        print message.ljust(self._line_len),
+        print(message.ljust(self._line_len), end=' ')
 
         self._start_time = time.time()
         return self
 
     def __exit__(self, *_):
         self._end_time = time.time()
-        print 'DONE (in %ds)' % int(self._end_time - self._start_time)
+        print('DONE (in %ds)' % int(self._end_time - self._start_time))
 
 
 class Evaluator:
@@ -193,8 +202,8 @@ class Evaluator:
             raise IllegalArgumentException(
                 'No %s > %s corpora found into specified path' % (self._source_lang, self._target_lang))
 
-        print '\n============== EVALUATION ==============\n'
-        print 'Testing on %d lines:\n' % sum([corpus.count_lines() for corpus in corpora])
+        print('\n============== EVALUATION ==============\n')
+        print('Testing on %d lines:\n' % sum([corpus.count_lines() for corpus in corpora]))
 
         if heval_output is not None:
             osutils.makedirs(heval_output, exist_ok=True)
@@ -248,10 +257,10 @@ class Evaluator:
                             entry.scores[scorer] = str(e)
 
             # Print results
-            print '\n=============== RESULTS ================\n'
+            print('\n=============== RESULTS ================\n')
 
             for scorer in self._scorers:
-                print scorer.name() + ':'
+                print(scorer.name() + ':')
 
                 for i, entry in enumerate(sorted(entries, key=lambda x: x.scores[scorer] if x.error is None else 0,
                                                  reverse=True)):
@@ -266,18 +275,18 @@ class Evaluator:
                     else:
                         text = str(entry.error)
 
-                    print '  %s: %s' % (entry.translator.name.ljust(20), text)
-                print
+                    print('  %s: %s' % (entry.translator.name.ljust(20), text))
+                print()
 
-            print 'Translation Speed:'
+            print('Translation Speed:')
             for entry in sorted(entries, key=lambda x: x.translation_time if x.error is None else float('inf')):
                 if entry.error is None:
                     text = '%.2fs per sentence' % entry.translation_time
                 else:
                     text = str(entry.error)
 
-                print '  %s: %s' % (entry.translator.name.ljust(20), text)
-            print
+                print('  %s: %s' % (entry.translator.name.ljust(20), text))
+            print()
         finally:
             if not debug:
                 self._engine.clear_tempdir('evaluation')
@@ -304,6 +313,6 @@ class Evaluator:
         except TranslateError as e:
             result.error = e
         except Exception as e:
-            result.error = TranslateError('Unexpected ERROR: ' + str(e.message))
+            result.error = TranslateError('Unexpected ERROR: ' + str(e))
 
         return result
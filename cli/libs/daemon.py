@@ -120,7 +120,7 @@ class DaemonController(object):
         while 1:
             try:
                 retpid, status = waitcall()
-            except OSError, err:
+            except OSError as err:
                 if err.errno == errno.EINTR:
                     delay = check_timeout(delay)
                     continue
@@ -3,9 +3,8 @@ import subprocess
 
 def list_gpus():
     try:
-        stdout = subprocess.check_output(['nvidia-smi', '-L'])
-        return map(lambda line: int(line.split(':')[0].replace('GPU ', '')),
-                   [x for x in stdout.splitlines() if x.startswith('GPU ')])
+        stdout = subprocess.check_output(['nvidia-smi', '-L'], universal_newlines=True)
+        return [int(line.split(':')[0].replace('GPU ', '')) for line in stdout.splitlines() if line.startswith('GPU ')]
     except subprocess.CalledProcessError:
         return []
     except OSError as e:
@@ -14,14 +13,20 @@ def list_gpus():
         raise
 
 
-def get_ram(gpu):
+def list_gpus_with_ram():
     try:
         stdout = subprocess.check_output(
-            ['nvidia-smi', '--query-gpu=memory.total', '--format=csv,noheader,nounits', '--id=%d' % gpu])
-        return int(stdout.strip()) * 1024 * 1024
+            ['nvidia-smi', '--query-gpu=index,memory.total', '--format=csv,noheader,nounits'],
+            universal_newlines=True)
+        return [(int(index), int(ram) * 1024 * 1024)
+                for index, ram in [line.split(',') for line in stdout.splitlines() if line.strip()]]
     except subprocess.CalledProcessError:
-        return 0
+        return []
     except OSError as e:
-        if e.errno == 2:   # nvidia-smi not installed
-            return 0
+        if e.errno == 2:  # nvidia-smi not installed
+            return []
         raise
+
+
+def get_ram(gpu):
+    return dict(list_gpus_with_ram()).get(gpu, 0)
@@ -4,6 +4,11 @@ import shutil
 
 from cli.libs import osutils
 
+try:
+    basestring
+except NameError:  # Python 3
+    basestring = str
+
 __author__ = 'Davide Caroselli'
 
 
@@ -137,7 +142,7 @@ class FileParallelCorpus(BilingualCorpus):
 
         self._lang2file = {source_lang: source_file, target_lang: target_file}
 
-        files = self._lang2file.values()
+        files = list(self._lang2file.values())
 
         self._root = os.path.abspath(os.path.join(files[0], os.pardir)) if len(files) > 0 else None
         self._lines_count = -1
@@ -155,7 +160,7 @@ class FileParallelCorpus(BilingualCorpus):
         return self._lines_count
 
     def copy(self, folder, suffixes=None):
-        for lang, f in self._lang2file.iteritems():
+        for lang, f in self._lang2file.items():
             suffix = suffixes[lang] if suffixes else ''
             shutil.copy(f, os.path.join(folder, os.path.basename(f) + suffix))
 
@@ -225,6 +230,8 @@ class FileParallelCorpus(BilingualCorpus):
 
                 return lines
 
+            __next__ = next
+
         return __r([self.get_file(l) for l in langs])
 
 
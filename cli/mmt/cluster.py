@@ -154,7 +154,7 @@ class ClusterNode(DaemonController):
         @staticmethod
         def _unpack_context(data):
             result = data['vectors']
-            return None if len(result) != 1 else result.values()[0]
+            return None if len(result) != 1 else list(result.values())[0]
 
         def translate(self, source, target, text, context=None, nbest=None, verbose=False, priority=None, user=None):
             p = {'q': text, 'source': source, 'target': target}
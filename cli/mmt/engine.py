@@ -1,10 +1,14 @@
+from __future__ import print_function
+
 import inspect
 import json
 import logging
 import os
 import shutil
+import sys
+import tempfile
 import time
-from xml.dom import minidom
+from xml.etree import ElementTree
 
 import glob
 
@@ -16,13 +20,86 @@ from cli.mmt import BilingualCorpus
 
 import warnings
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 warnings.filterwarnings('ignore', category=FutureWarning)
 warnings.filterwarnings("ignore", message="numpy.dtype size changed")
 
 __author__ = 'Davide Caroselli'
 
+# inspect.getargspec() has been removed in Python 3.11
+_getargspec = getattr(inspect, 'getfullargspec', None) or inspect.getargspec
+
+
+def _json_dumps(obj):
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode('utf-8')
+
+
+def _json_loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data.decode('utf-8'))
+
+
+def _write_input_list(paths):
+    # Input roots are passed to the Java mains through a file (one path per line) with "--input-list",
+    # so that the command line length does not depend on the number of roots
+    content = '\n'.join(paths) + '\n'
+    if not isinstance(content, bytes):
+        content = content.encode('utf-8')
+
+    fd, input_list = tempfile.mkstemp(prefix='mmt-inputs-', suffix='.txt')
+    try:
+        os.write(fd, content)
+    finally:
+        os.close(fd)
+
+    return input_list
+
+
+# Parsed engine configs, keyed by config path and validated against the file (mtime, size):
+# the cache is persisted in the runtime folder so that it survives across CLI invocations
+_CONFIG_CACHE_FILE = os.path.join(cli.RUNTIME_DIR, 'config-cache.json')
+
+
+def _load_config_cache():
+    try:
+        with open(_CONFIG_CACHE_FILE) as json_file:
+            return json.load(json_file)
+    except (IOError, ValueError):
+        return {}
+
+
+def _store_config_cache():
+    # entries of deleted engines are dropped
+    for config_path in [path for path in _CONFIG_CACHE if not os.path.isfile(path)]:
+        del _CONFIG_CACHE[config_path]
+
+    # every process writes its own temp file, so that concurrent CLI invocations never publish a torn cache
+    tmp_file = None
+
+    try:
+        fd, tmp_file = tempfile.mkstemp(prefix='config-cache-', suffix='.tmp', dir=cli.RUNTIME_DIR)
+        with os.fdopen(fd, 'w') as json_file:
+            json.dump(_CONFIG_CACHE, json_file)
+        os.rename(tmp_file, _CONFIG_CACHE_FILE)
+    except (IOError, OSError):
+        # the cache is only an optimization, never fail because of it
+        if tmp_file is not None and os.path.isfile(tmp_file):
+            os.remove(tmp_file)
+
+
+_CONFIG_CACHE = _load_config_cache()
+
 
 class TMCleaner:
+    # Every CleaningPipelineMain already cleans its corpora with up to 10 IO threads (BatchCopyProcess), and only
+    # corpora smaller than 1/10 of its heap go to the parallel path: with 20GB per JVM that threshold is not lower
+    # than the 2GB TrainingFacade uses by default
+    _JVM_IO_THREADS = 10
+    _MIN_SHARD_HEAP_MB = 20 * 1024
+
     def __init__(self, source_lang, target_lang):
         self._source_lang = source_lang
         self._target_lang = target_lang
@@ -33,18 +110,70 @@ class TMCleaner:
         if log is None:
             log = osutils.DEVNULL
 
-        args = ['-s', self._source_lang, '-t', self._target_lang,
-                '--output', output_path, '--input']
+        input_paths = sorted({corpus.get_folder() for corpus in corpora})
+
+        # Input roots are split in shards that are cleaned by parallel JVMs, each one writing to its own folder and
+        # sharing the available memory: shards are added only while their IO threads fit in the available CPUs
+        # and each JVM keeps at least the minimum heap
+        heap_mb = osutils.mem_size() * 90 / 100
+        shards_count = max(1, min(len(input_paths),
+                                  osutils.cpu_count() // self._JVM_IO_THREADS,
+                                  int(heap_mb // self._MIN_SHARD_HEAP_MB)))
+        extended_heap_mb = int(heap_mb / shards_count)
 
-        input_paths = set([corpus.get_folder() for corpus in corpora])
+        if shards_count == 1:
+            shards = [(input_paths, output_path)]
+        else:
+            osutils.rmtree(output_path)
+            osutils.makedirs(output_path, exist_ok=True)
 
-        for root in input_paths:
-            args.append(root)
+            shards = [(input_paths[i::shards_count], os.path.join(output_path, 'shard_%d' % i))
+                      for i in range(shards_count)]
 
-        extended_heap_mb = int(osutils.mem_size() * 90 / 100)
+        input_lists = []
+        processes = []
 
-        command = mmt_javamain(self._java_main, args=args, max_heap_mb=extended_heap_mb)
-        osutils.shell_exec(command, stdout=log, stderr=log)
+        try:
+            for roots, shard_path in shards:
+                input_list = _write_input_list(roots)
+                input_lists.append(input_list)
+
+                args = ['-s', self._source_lang, '-t', self._target_lang,
+                        '--output', shard_path, '--input-list', input_list]
+
+                command = mmt_javamain(self._java_main, args=args, max_heap_mb=extended_heap_mb)
+                processes.append((command, osutils.shell_exec(command, stdout=log, stderr=log, background=True)))
+
+            # poll all shards, so that the first failure is reported as soon as it happens
+            running = list(processes)
+            while running:
+                for command, process in list(running):
+                    return_code = process.poll()
+
+                    if return_code is None:
+                        continue
+                    if return_code != 0:
+                        raise ShellError(' '.join(command), return_code, None)
+
+                    running.remove((command, process))
+
+                if running:
+                    time.sleep(1)
+        finally:
+            # if a shard failed (or we have been interrupted), no other JVM must keep writing in output_path
+            for _, process in processes:
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+
+            for input_list in input_lists:
+                os.remove(input_list)
+
+        if len(shards) > 1:
+            for _, shard_path in shards:
+                for filename in os.listdir(shard_path):
+                    os.rename(os.path.join(shard_path, filename), os.path.join(output_path, filename))
+                os.rmdir(shard_path)
 
         return BilingualCorpus.list(self._source_lang, self._target_lang, output_path)
 
@@ -60,20 +189,23 @@ class TrainingPreprocessor:
         if log is None:
             log = osutils.DEVNULL
 
-        args = ['-s', self._source_lang, '-t', self._target_lang, '--output', output_path, '--input']
+        input_list = _write_input_list(sorted({corpus.get_folder() for corpus in corpora}))
 
-        for root in set([corpus.get_folder() for corpus in corpora]):
-            args.append(root)
-
-        if dev_data_path is not None:
-            args.append('--dev')
-            args.append(dev_data_path)
-        if test_data_path is not None:
-            args.append('--test')
-            args.append(test_data_path)
-
-        command = mmt_javamain(self._java_main, args)
-        osutils.shell_exec(command, stdout=log, stderr=log)
+        try:
+            args = ['-s', self._source_lang, '-t', self._target_lang, '--output', output_path,
+                    '--input-list', input_list]
+
+            if dev_data_path is not None:
+                args.append('--dev')
+                args.append(dev_data_path)
+            if test_data_path is not None:
+                args.append('--test')
+                args.append(test_data_path)
+
+            command = mmt_javamain(self._java_main, args)
+            osutils.shell_exec(command, stdout=log, stderr=log)
+        finally:
+            os.remove(input_list)
 
         return BilingualCorpus.list(self._source_lang, self._target_lang, output_path)
 
@@ -95,12 +227,12 @@ class FastAlign:
         shutil.rmtree(self._parent, ignore_errors=True)
         osutils.makedirs(self._parent, exist_ok=True)
 
-        source_path = set([corpus.get_folder() for corpus in corpora])
+        source_path = {corpus.get_folder() for corpus in corpora}
         assert len(source_path) == 1
         source_path = source_path.pop()
 
         command = [self._build_bin, '-s', self._source_lang, '-t', self._target_lang, '-i', source_path,
-                   '-m', self._model, '-I', '4']
+                   '-m', self._model, '-I', '4', '-T', str(osutils.cpu_count())]
         osutils.shell_exec(command, stdout=log, stderr=log)
 
 
@@ -131,7 +263,7 @@ class NeuralDecoder(object):
 
     @staticmethod
     def _get_common_root(corpora):
-        roots = set([corpus.get_folder() for corpus in corpora])
+        roots = {corpus.get_folder() for corpus in corpora}
         if len(roots) > 1:
             raise ValueError('Corpora must be contained in the same folder: ' + str(corpora))
         return roots.pop()
@@ -246,7 +378,7 @@ class NeuralDecoder(object):
         global_steps = max([(steps - (steps % 100)) for steps, _ in checkpoint_pairs])
         checkpoints = [path for (_, path) in checkpoint_pairs]
 
-        logger.info('(finalize_model) Averaging checkpoints: %s' % str(checkpoints))
+        logger.info('(finalize_model) Averaging checkpoints: %s', checkpoints)
 
         # Read variables from all checkpoints and average them.
         var_list = tf.contrib.framework.list_variables(checkpoints[0])
@@ -271,7 +403,7 @@ class NeuralDecoder(object):
             gpu = None
             device = '/cpu:0'
 
-        logger.info('(finalize_model) Running on device: %s' % device)
+        logger.info('(finalize_model) Running on device: %s', device)
 
         with tf.device(device):
             tf_vars = [tf.get_variable(n, shape=var_values[n].shape, dtype=var_dtypes[n]) for n in var_values]
@@ -376,7 +508,27 @@ class Engine(object):
 
     @staticmethod
     def list():
-        return sorted([name for name in os.listdir(cli.ENGINES_DIR) if os.path.isfile(Engine._get_config_path(name))])
+        if hasattr(os, 'scandir'):
+            # scandir() already knows the entry type, so plain files in the engines folder are never stat-ed
+            names = sorted([entry.name for entry in os.scandir(cli.ENGINES_DIR)
+                            if entry.is_dir() and os.path.isfile(os.path.join(entry.path, 'engine.xconf'))])
+        else:
+            names = sorted([name for name in os.listdir(cli.ENGINES_DIR)
+                            if os.path.isfile(Engine._get_config_path(name))])
+
+        # Read the languages of all the engines in one pass, so that cache misses are stored with a single write
+        # and the following Engine.load() calls are cache hits
+        updated = False
+        for name in names:
+            try:
+                updated = Engine._read_languages(Engine._get_config_path(name))[1] or updated
+            except (IllegalArgumentException, ElementTree.ParseError):
+                pass  # reported by Engine.load()
+
+        if updated:
+            _store_config_cache()
+
+        return names
 
     @staticmethod
     def load(name):
@@ -388,28 +540,70 @@ class Engine(object):
         if not os.path.isfile(config_path):
             raise IllegalArgumentException("Engine '%s' not found" % name)
 
-        # parse the source language and target language from the configuration file
-        def _get_child(root, child_name):
-            elements = root.getElementsByTagName(child_name)
-            return elements[0] if len(elements) > 0 else None
+        return Engine(name, Engine._get_languages(config_path))
 
+    @staticmethod
+    def _get_languages(config_path):
+        languages, updated = Engine._read_languages(config_path)
+        if updated:
+            _store_config_cache()
+
+        return languages
+
+    @staticmethod
+    def _read_languages(config_path):
+        # returns the engine languages and whether the cache entry has been updated
+        stat = os.stat(config_path)
+        key = [stat.st_mtime, stat.st_size]
+
+        entry = _CONFIG_CACHE.get(config_path)
+        if entry is not None and entry[0] == key:
+            return [tuple(pair) for pair in entry[1]], False
+
+        languages = Engine._parse_languages(config_path)
+        _CONFIG_CACHE[config_path] = [key, languages]
+
+        return languages, True
+
+    @staticmethod
+    def _parse_languages(config_path):
+        # parse the source language and target language from the configuration file,
+        # stopping as soon as the <engine> element has been read
         languages = []
+        engine_attrs = None
+        languages_found = False
+        root = None
+
+        for event, element in ElementTree.iterparse(config_path, events=('start', 'end')):
+            tag = element.tag.rsplit('}', 1)[-1]
+
+            if event == 'start':
+                if root is None:
+                    root = element
+
+                if tag == 'engine' and engine_attrs is None:
+                    engine_attrs = dict(element.attrib)
+                elif tag == 'languages' and engine_attrs is not None:
+                    languages_found = True
+                elif tag == 'pair' and languages_found:
+                    languages.append((element.get('source'), element.get('target')))
+            elif (tag == 'languages' and languages_found) or (tag == 'engine' and engine_attrs is not None):
+                break
+            else:
+                # attributes are read on 'start' events: completed elements can be discarded
+                element.clear()
+                if element in root:
+                    root.remove(element)
 
-        config_root = minidom.parse(config_path).documentElement
-        engine_el = _get_child(config_root, 'engine')
-        lang_el = _get_child(engine_el, 'languages')
+        if engine_attrs is None:
+            raise IllegalArgumentException('Invalid engine config "%s": missing <engine> element' % config_path)
 
-        if lang_el is not None:
-            for pair_el in lang_el.getElementsByTagName('pair'):
-                source_lang = pair_el.getAttribute('source')
-                target_lang = pair_el.getAttribute('target')
-                languages.append((source_lang, target_lang))
-        else:
-            source_lang = engine_el.getAttribute('source-language')
-            target_lang = engine_el.getAttribute('target-language')
+        if not languages_found:
+            source_lang = engine_attrs.get('source-language')
+            target_lang = engine_attrs.get('target-language')
             languages.append((source_lang, target_lang))
 
-        return Engine(name, languages)
+        return languages
 
     def __init__(self, name, languages):
         # properties
@@ -425,12 +619,20 @@ class Engine(object):
         self.logs_path = os.path.join(self.runtime_path, 'logs')
         self.temp_path = os.path.join(self.runtime_path, 'tmp')
 
+        self._dirs_ready = False
+
+    def _ensure_dirs(self):
+        if not self._dirs_ready:
+            osutils.makedirs(self.logs_path, exist_ok=True)
+            osutils.makedirs(self.temp_path, exist_ok=True)
+            self._dirs_ready = True
+
     def exists(self):
         return os.path.isfile(self.config_path)
 
     def get_logfile(self, name, ensure=True, append=False):
-        if ensure and not os.path.isdir(self.logs_path):
-            osutils.makedirs(self.logs_path, exist_ok=True)
+        if ensure:
+            self._ensure_dirs()
 
         logfile = os.path.join(self.logs_path, name + '.log')
 
@@ -440,31 +642,41 @@ class Engine(object):
         return logfile
 
     def get_tempdir(self, name, ensure=True):
-        if ensure and not os.path.isdir(self.temp_path):
-            osutils.makedirs(self.temp_path, exist_ok=True)
+        if ensure:
+            self._ensure_dirs()
 
         folder = os.path.join(self.temp_path, name)
 
         if ensure:
-            shutil.rmtree(folder, ignore_errors=True)
+            osutils.rmtree(folder)
             os.makedirs(folder)
 
         return folder
 
     def get_tempfile(self, name, ensure=True):
-        if ensure and not os.path.isdir(self.temp_path):
-            osutils.makedirs(self.temp_path, exist_ok=True)
+        if ensure:
+            self._ensure_dirs()
         return os.path.join(self.temp_path, name)
 
     def clear_tempdir(self, subdir=None):
-        path = os.path.join(self.temp_path, subdir) if subdir is not None else self.temp_path
-        shutil.rmtree(path, ignore_errors=True)
+        if subdir is not None:
+            osutils.rmtree(os.path.join(self.temp_path, subdir))
+        else:
+            osutils.rmtree(self.temp_path)
+            self._dirs_ready = False
 
 
 class EngineBuilder:
     _MB = (1024 * 1024)
     _GB = (1024 * 1024 * 1024)
 
+    _CONFIG_TEMPLATE = \
+        b'<node xsi:schemaLocation="http://www.modernmt.eu/schema/config mmt-config-1.0.xsd"\n' \
+        b'      xmlns="http://www.modernmt.eu/schema/config"\n' \
+        b'      xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">\n' \
+        b'   <engine source-language="%s" target-language="%s" />\n' \
+        b'</node>'
+
     class Step:
         class Instance:
             def __init__(self, f, seq_num, name, optional, hidden):
@@ -476,6 +688,9 @@ class EngineBuilder:
                 self._f = f
                 self._seq_num = seq_num
 
+                # the signature of a step never changes, inspect it only once
+                self._accepted_args = frozenset(_getargspec(f).args)
+
             def is_optional(self):
                 return self._optional
 
@@ -486,14 +701,9 @@ class EngineBuilder:
                 return self._seq_num
 
             def __call__(self, *args, **kwargs):
-                names, _, _, _ = inspect.getargspec(self._f)
-
-                if 'delete_on_exit' not in names:
-                    del kwargs['delete_on_exit']
-                if 'log' not in names:
-                    del kwargs['log']
-                if 'skip' not in names:
-                    del kwargs['skip']
+                for name in ('delete_on_exit', 'log', 'skip'):
+                    if name not in self._accepted_args:
+                        kwargs.pop(name, None)
 
                 self._f(*args, **kwargs)
 
@@ -508,74 +718,106 @@ class EngineBuilder:
 
     class __Args(object):
         def __init__(self):
-            pass
+            self.__dict__['_lazy_values'] = {}
 
         def __getattr__(self, item):
+            lazy_values = self.__dict__['_lazy_values']
+
+            if item in lazy_values:
+                value = lazy_values.pop(item)()
+                self.__dict__[item] = value
+                return value
+
             return self.__dict__[item] if item in self.__dict__ else None
 
         def __setattr__(self, key, value):
+            self.__dict__['_lazy_values'].pop(key, None)
             self.__dict__[key] = value
 
+        def set_lazy(self, key, f):
+            # f() is invoked only the first time the attribute is read
+            self.__dict__.pop(key, None)
+            self.__dict__['_lazy_values'][key] = f
+
     class __Schedule:
         def __init__(self, plan, filtered_steps=None):
             self._plan = plan
             self._passed_steps = []
+            self._passed_steps_set = set()
 
             all_steps = self.all_steps()
 
             if filtered_steps is not None:
-                self._scheduled_steps = self.required_steps(filtered_steps)
+                scheduled_steps = self.required_steps(filtered_steps)
 
-                unknown_steps = [step for step in self._scheduled_steps if step not in all_steps]
+                unknown_steps = [step for step in scheduled_steps if step not in all_steps]
                 if len(unknown_steps) > 0:
                     raise IllegalArgumentException('Unknown training steps: ' + str(unknown_steps))
             else:
-                self._scheduled_steps = all_steps
+                scheduled_steps = all_steps
+
+            # the plan never changes once created: resolve all its views only once
+            self._scheduled_steps = frozenset(scheduled_steps)
+            self._resolved_plan = [el for el in self._plan if el.id in self._scheduled_steps or not el.is_optional()]
+            self._visible_steps = [x.id for x in self._plan if x.id in self._scheduled_steps and not x.is_hidden()]
 
         def __len__(self):
             return len(self._scheduled_steps)
 
         def __iter__(self):
-            class __Inner:
-                def __init__(self, plan):
-                    self._plan = plan
-                    self._idx = 0
-
-                def next(self):
-                    if self._idx < len(self._plan):
-                        self._idx += 1
-                        return self._plan[self._idx - 1]
-                    else:
-                        raise StopIteration
-
-            return __Inner([el for el in self._plan if el.id in self._scheduled_steps or not el.is_optional()])
+            return iter(self._resolved_plan)
 
         def required_steps(self, steps):
             max_seq_num = max([x.pos() for x in self._plan if x.id in steps])
             return [x.id for x in self._plan if x.pos() <= max_seq_num]
 
         def visible_steps(self):
-            return [x.id for x in self._plan if x.id in self._scheduled_steps and not x.is_hidden()]
+            return self._visible_steps
 
         def all_steps(self):
             return [e.id for e in self._plan]
 
         def store(self, path):
-            with open(path, 'w') as json_file:
-                json.dump(self._passed_steps, json_file)
+            # Writes the full list of passed steps to the checkpoint file and discards the steps log
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as json_file:
+                json_file.write(_json_dumps(self._passed_steps))
+            os.rename(tmp_path, path)
+
+            if os.path.isfile(path + '.log'):
+                os.remove(path + '.log')
+
+        def store_step(self, path, step):
+            # Appends a single completed step to the steps log, without rewriting the checkpoint file
+            with open(path + '.log', 'ab') as log_file:
+                log_file.write(_json_dumps(step) + b'\n')
 
         def load(self, path):
             try:
-                with open(path) as json_file:
-                    self._passed_steps = json.load(json_file)
+                with open(path, 'rb') as json_file:
+                    self._passed_steps = _json_loads(json_file.read())
             except IOError:
                 self._passed_steps = []
 
+            try:
+                with open(path + '.log', 'rb') as log_file:
+                    self._passed_steps += [_json_loads(line) for line in log_file if line.strip()]
+            except IOError:
+                pass
+
+            self._passed_steps_set = set(self._passed_steps)
+
         def step_completed(self, step):
+            # returns False if the step was already completed (i.e. skipped on resume)
+            if step in self._passed_steps_set:
+                return False
+
             self._passed_steps.append(step)
+            self._passed_steps_set.add(step)
+            return True
 
         def is_completed(self, step):
-            return step in self._passed_steps
+            return step in self._passed_steps_set
 
     @staticmethod
     def all_visible_steps():
@@ -621,9 +863,8 @@ class EngineBuilder:
     def _get_tempdir(self, name, delete_if_exists=False):
         path = os.path.join(self._temp_dir, name)
         if delete_if_exists:
-            shutil.rmtree(path, ignore_errors=True)
-        if not os.path.isdir(path):
-            osutils.makedirs(path, exist_ok=True)
+            osutils.rmtree(path)
+        osutils.makedirs(path, exist_ok=True)
         return path
 
     # ~~~~~~~~~~~~~~~~~~~~~~~~~~ Engine creation management ~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -652,14 +893,21 @@ class EngineBuilder:
         # if no old engines (i.e. engine folders) can be found, create a new one from scratch
         # if we are not trying to resume an old one, create from scratch anyway
         if not os.path.isdir(self._engine.path) or not resume:
-            shutil.rmtree(self._engine.path, ignore_errors=True)
+            osutils.rmtree(self._engine.path)
             os.makedirs(self._engine.path)
 
         # Create a new logger for the building activities,
         log_file = self._engine.get_logfile('training', append=resume)
-        log_stream = open(log_file, 'ab' if resume else 'wb')
-        logging.basicConfig(format='%(asctime)-15s [%(levelname)s] - %(message)s',
-                            level=logging.DEBUG, stream=log_stream)
+        # (if not resuming, get_logfile() already removed the previous log: both streams can append to it).
+        # The unbuffered O_APPEND stream is handed to the steps' subprocesses, that write straight to its fd
+        log_stream = os.fdopen(os.open(log_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644), 'ab', 0)
+        log_handler = logging.FileHandler(log_file, mode='a', encoding='utf-8')
+        log_handler.setFormatter(logging.Formatter('%(asctime)-15s [%(levelname)s] - %(message)s'))
+
+        root_logger = logging.getLogger()
+        root_logger.setLevel(logging.DEBUG)
+        root_logger.addHandler(log_handler)
+
         logger = logging.getLogger('EngineBuilder')
 
         # Start the engine building (training) phases
@@ -667,20 +915,20 @@ class EngineBuilder:
         log_line_len = 70
 
         try:
-            logger.log(logging.INFO, 'Training started: engine=%s, corpora=%d, lang_pair=%s-%s' %
-                       (self._engine.name, len(corpora), self.source_lang, self.target_lang))
+            logger.info('Training started: engine=%s, corpora=%d, lang_pair=%s-%s',
+                        self._engine.name, len(corpora), self.source_lang, self.target_lang)
 
-            print '\n=========== TRAINING STARTED ===========\n'
-            print 'ENGINE:  %s' % self._engine.name
-            print 'CORPORA: %d corpora' % len(corpora)
-            print 'LANGS:   %s > %s' % (self.source_lang, self.target_lang)
-            print
+            print('\n=========== TRAINING STARTED ===========\n')
+            print('ENGINE:  %s' % self._engine.name)
+            print('CORPORA: %d corpora' % len(corpora))
+            print('LANGS:   %s > %s' % (self.source_lang, self.target_lang))
+            print()
 
             # Check if all requirements are fulfilled before actual engine training
             try:
                 self._check_constraints()
             except EngineBuilder.HWConstraintViolated as e:
-                print '\033[91mWARNING\033[0m: %s\n' % e.cause
+                print('\033[91mWARNING\033[0m: %s\n' % e.cause)
 
             args = EngineBuilder.__Args()
             args.corpora = corpora
@@ -692,13 +940,14 @@ class EngineBuilder:
 
             for method in self._schedule:
                 if not method.is_hidden():
-                    print ('INFO: (%d of %d) %s... ' % (step_index, steps_count, method.name)).ljust(log_line_len),
+                    print(('INFO: (%d of %d) %s... ' % (step_index, steps_count, method.name)).ljust(log_line_len),
+                          end=' ')
+                    sys.stdout.flush()
 
                 skip = self._schedule.is_completed(method.id)
                 self._step_start_time = time.time()
 
-                logger.log(logging.INFO, 'Training step "%s" (%d/%d) started' %
-                           (method.id, step_index, len(self._schedule)))
+                logger.info('Training step "%s" (%d/%d) started', method.id, step_index, len(self._schedule))
 
                 start_time = time.time()
                 method(self, args, skip=skip, log=log_stream, delete_on_exit=self._delete_on_exit)
@@ -706,17 +955,19 @@ class EngineBuilder:
 
                 if not method.is_hidden():
                     step_index += 1
-                    print 'DONE (in %s)' % elapsed_time_str
+                    print('DONE (in %s)' % elapsed_time_str)
 
-                logger.log(logging.INFO, 'Training step "%s" completed in %s' % (method.id, elapsed_time_str))
+                logger.info('Training step "%s" completed in %s', method.id, elapsed_time_str)
 
-                self._schedule.step_completed(method.id)
-                self._schedule.store(checkpoint_path)
+                if self._schedule.step_completed(method.id):
+                    self._schedule.store_step(checkpoint_path, method.id)
 
-            print '\n=========== TRAINING SUCCESS ===========\n'
-            print 'You can now start, stop or check the status of the server with command:'
-            print '\t./mmt start|stop|status ' + ('' if self._engine.name == 'default' else '-e %s' % self._engine.name)
-            print
+            self._schedule.store(checkpoint_path)
+
+            print('\n=========== TRAINING SUCCESS ===========\n')
+            print('You can now start, stop or check the status of the server with command:')
+            print('\t./mmt start|stop|status ' + ('' if self._engine.name == 'default' else '-e %s' % self._engine.name))
+            print()
 
             if self._delete_on_exit:
                 self._engine.clear_tempdir('training')
@@ -724,26 +975,21 @@ class EngineBuilder:
             logger.exception('Unexpected exception')
             raise
         finally:
+            root_logger.removeHandler(log_handler)
+            log_handler.close()
             log_stream.close()
 
+    _TIME_UNITS = ((86400, 'd'), (3600, 'h'), (60, 'm'), (1, 's'))
+
     @staticmethod
     def _pretty_print_time(elapsed):
         elapsed = int(elapsed)
         parts = []
 
-        if elapsed > 86400:  # days
-            d = int(elapsed / 86400)
-            elapsed -= d * 86400
-            parts.append('%dd' % d)
-        if elapsed > 3600:  # hours
-            h = int(elapsed / 3600)
-            elapsed -= h * 3600
-            parts.append('%dh' % h)
-        if elapsed > 60:  # minutes
-            m = int(elapsed / 60)
-            elapsed -= m * 60
-            parts.append('%dm' % m)
-        parts.append('%ds' % elapsed)
+        for unit_seconds, unit in EngineBuilder._TIME_UNITS:
+            value, elapsed = divmod(elapsed, unit_seconds)
+            if value > 0 or unit == 's':
+                parts.append('%d%s' % (value, unit))
 
         return ' '.join(parts)
 
@@ -758,8 +1004,10 @@ class EngineBuilder:
 
         recommended_gpu_ram = 8 * self._GB
 
+        gpus_ram = dict(nvidia_smi.list_gpus_with_ram())
+
         for gpu in self._gpus:
-            gpu_ram = nvidia_smi.get_ram(gpu)
+            gpu_ram = gpus_ram.get(gpu, 0)
 
             if gpu_ram < recommended_gpu_ram:
                 raise EngineBuilder.HWConstraintViolated(
@@ -773,7 +1021,7 @@ class EngineBuilder:
         folder = self._get_tempdir('clean_corpora')
 
         if skip:
-            args.corpora = BilingualCorpus.list(self.source_lang, self.target_lang, folder)
+            args.set_lazy('corpora', lambda: BilingualCorpus.list(self.source_lang, self.target_lang, folder))
         else:
             args.corpora = self._cleaner.clean(args.corpora, folder, log=log)
 
@@ -785,8 +1033,10 @@ class EngineBuilder:
         raw_valid_folder = os.path.join(preprocessed_folder, 'extracted_validation')
 
         if skip:
-            args.processed_train_corpora = BilingualCorpus.list(self.source_lang, self.target_lang, train_folder)
-            args.processed_valid_corpora = BilingualCorpus.list(self.source_lang, self.target_lang, valid_folder)
+            args.set_lazy('processed_train_corpora',
+                          lambda: BilingualCorpus.list(self.source_lang, self.target_lang, train_folder))
+            args.set_lazy('processed_valid_corpora',
+                          lambda: BilingualCorpus.list(self.source_lang, self.target_lang, valid_folder))
         else:
             if not args.corpora:
                 raise CorpusNotFoundInFolderException('Could not find any valid %s > %s segments in your input.' %
@@ -809,27 +1059,25 @@ class EngineBuilder:
     @Step(3, 'Aligner training')
     def _train_aligner(self, args, skip=False, log=None):
         if not skip:
-            corpora = filter(None, [args.processed_train_corpora, args.corpora])[0]
+            corpora = args.processed_train_corpora or args.corpora
             self._aligner.build(corpora, log=log)
 
     @Step(4, 'Writing config', optional=False, hidden=True)
     def _write_config(self, _):
-        xml_template = \
-            '<node xsi:schemaLocation="http://www.modernmt.eu/schema/config mmt-config-1.0.xsd"\n' \
-            '      xmlns="http://www.modernmt.eu/schema/config"\n' \
-            '      xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">\n' \
-            '   <engine source-language="%s" target-language="%s" />\n' \
-            '</node>'
+        content = self._CONFIG_TEMPLATE % (self.source_lang.encode('utf-8'), self.target_lang.encode('utf-8'))
 
-        with open(self._engine.config_path, 'wb') as out:
-            out.write(xml_template % (self.source_lang, self.target_lang))
+        fd = os.open(self._engine.config_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, content)
+        finally:
+            os.close(fd)
 
     @Step(5, 'Preparing data')
     def _prepare_data(self, args, skip=False, log=None):
         args.prepared_data_path = self._get_tempdir('neural_train_data')
 
         if not skip:
-            train_corpora = filter(None, [args.processed_train_corpora, args.corpora])[0]
+            train_corpora = args.processed_train_corpora or args.corpora
             eval_corpora = args.processed_valid_corpora or BilingualCorpus.list(self.source_lang, self.target_lang,
                                                                                 self._validation_path)
             self._decoder.prepare_data(train_corpora, eval_corpora, args.prepared_data_path,
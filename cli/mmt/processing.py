@@ -1,11 +1,17 @@
 import os
 import re
-from HTMLParser import HTMLParser
 
 from cli import mmt_javamain
 from cli.libs import osutils
 from cli.mmt import BilingualCorpus
 
+try:
+    from html import unescape as _html_unescape
+except ImportError:  # Python 2
+    from HTMLParser import HTMLParser
+
+    _html_unescape = HTMLParser().unescape
+
 __author__ = 'Davide Caroselli'
 
 
@@ -55,7 +61,6 @@ class XMLEncoder:
     __TAG_NAME = '([a-zA-Z]|_|:)([a-zA-Z]|[0-9]|\\.|-|_|:|)*'
     __TAG_REGEX = re.compile('(<(' + __TAG_NAME + ')[^>]*/?>)|(<!(' + __TAG_NAME + ')[^>]*[^/]>)|(</(' +
                              __TAG_NAME + ')[^>]*>)|(<!--)|(-->)')
-    __HTML = HTMLParser()
 
     def __init__(self):
         pass
@@ -84,7 +89,7 @@ class XMLEncoder:
 
     def encode_file(self, source, dest_file, delete_nl=False):
         with open(dest_file, 'wb') as outstream:
-            with open(source) as instream:
+            with open(source, 'rb') as instream:
                 for line in instream:
                     encoded = self.encode_string(line.decode('utf-8'))
                     encoded = encoded.rstrip('\r\n')
@@ -97,7 +102,7 @@ class XMLEncoder:
 
     @staticmethod
     def escape(string):
-        escaped = XMLEncoder.__HTML.unescape(string)
+        escaped = _html_unescape(string)
         return escaped \
             .replace('&', '&amp;') \
             .replace('<', '&lt;') \
@@ -105,7 +110,7 @@ class XMLEncoder:
 
     @staticmethod
     def unescape(string):
-        return XMLEncoder.__HTML.unescape(string)
+        return _html_unescape(string)
 
     def encode_string(self, string):
         result = []
@@ -134,11 +139,11 @@ class XMLEncoder:
             end = match.end()
 
             if index != start:
-                result.append(self.__HTML.unescape(string[index:start]).strip())
+                result.append(_html_unescape(string[index:start]).strip())
 
             index = end
 
         if index < len(string):
-            result.append(self.__HTML.unescape(string[index:]).strip())
+            result.append(_html_unescape(string[index:]).strip())
 
         return ' '.join(result)
@@ -1,4 +1,4 @@
-#!/usr/bin/env python2
+#!/usr/bin/env python
 
 # CharCut: lightweight character-based MT output highlighting and scoring.
 # Copyright (C) 2017 Lardilleux
@@ -23,7 +23,10 @@ This module can be used as a standalone program, but it also exposes some functi
 so that they be reused in other projects.
 """
 
+from __future__ import print_function
+
 import argparse
+import codecs
 import difflib
 import gzip
 import math
@@ -136,7 +139,7 @@ def iter_common_substrings(seq1, seq2, start_pos1, start_pos2, min_match_size, a
             if i + offset < n2:
                 tokens2[seq2[i+offset]].append(i)
         # Take intersection of the two token sets
-        for token, ok_pos1 in tokens1.iteritems():
+        for token, ok_pos1 in tokens1.items():
             ok_pos2 = tokens2.get(token)
             if ok_pos2:
                 first_pos = ok_pos1[0]
@@ -150,7 +153,7 @@ def iter_common_substrings(seq1, seq2, start_pos1, start_pos2, min_match_size, a
                 todo.append((ok_pos1, ok_pos2, offset+1))
 
 
-WORD_RE = re.compile('(\W)', re.UNICODE)
+WORD_RE = re.compile(r'(\W)', re.UNICODE)
 
 def word_split(seq):
     """
@@ -190,7 +193,7 @@ def start_pos(words):
         pos += len(elt)
 
 
-CHAR_RE = re.compile('(\w+)', re.UNICODE)
+CHAR_RE = re.compile(r'(\w+)', re.UNICODE)
 
 def char_split(seq, sep_sign):
     """
@@ -218,11 +221,11 @@ def char_split(seq, sep_sign):
     tokens = [u'', split[0], u''] if len(split) == 1 else split
     # "tokens" alternate actual words and runs of non-word characters
     starts = list(start_pos(tokens))
-    for i in xrange(0, len(tokens)-2, 2):
+    for i in range(0, len(tokens)-2, 2):
         # insert unique separator to prevent common substrings to span multiple words
         if i:
             yield None, i * sep_sign, False
-        for j in xrange(i, i+3):
+        for j in range(i, i+3):
             is_start_pos = j != i+2
             for k, char in enumerate(tokens[j], starts[j]):
                 yield k, char, is_start_pos
@@ -298,7 +301,7 @@ def greedy_matching(seq1, seq2, min_match_size):
     match_it = chain(word_based_matches(seq1, seq2, min_match_size),
                      char_based_matches(seq1, seq2, min_match_size))
     dedup = {match[0]: match for match in match_it}
-    match_list = sorted(dedup.itervalues(), key=order_key)
+    match_list = sorted(dedup.values(), key=order_key)
 
     # Consume all common substrings, longest first
     while match_list:
@@ -333,8 +336,8 @@ def find_regular_matches(ops):
     matches2 = sorted(matches1, key=lambda match: match[1])
     # Search for the longest common subsequence in characters
     # Expand "string" matches into "character" matches
-    char_matches1 = [(m, i) for m in matches1 for i in xrange(len(m[2]))]
-    char_matches2 = [(m, i) for m in matches2 for i in xrange(len(m[2]))]
+    char_matches1 = [(m, i) for m in matches1 for i in range(len(m[2]))]
+    char_matches2 = [(m, i) for m in matches2 for i in range(len(m[2]))]
     sm = difflib.SequenceMatcher(None, char_matches1, char_matches2, autojunk=False)
     return {m for a, _, size in sm.get_matching_blocks()
             for m, _ in char_matches1[a:a + size]}
@@ -480,11 +483,11 @@ def ops2html(styled_ops, seg_id):
     for op in styled_ops:
         _, _, slice, dist, css, css_id = op
         substr_id = u'seg{}_{}'.format(seg_id, css_id)
-        dist_str = u'({:+d})'.format(dist) if dist else ''
+        dist_str = u'({:+d})'.format(dist) if dist else u''
         slice_len = len(slice)
         yield u'<span title="{css}{dist_str}: {slice_len}" class="{css} {substr_id}" ' \
               u'onmouseenter="enter(\'{substr_id}\')" onmouseleave="leave(\'{substr_id}\')">' \
-              u'{slice}</span>'.format(**locals()).encode('u8')
+              u'{slice}</span>'.format(**locals())
 
 
 def segs2html(segs, ops, score_pair):
@@ -493,14 +496,14 @@ def segs2html(segs, ops, score_pair):
     styled_cand, styled_ref = ops
     cost, div = score_pair
     score = (1.*cost/div) if div else 0
-    origin_str = '<p class="detail">({})</p>'.format(origin) if origin else ''
-    src_str = '''<tr>
+    origin_str = u'<p class="detail">({})</p>'.format(origin) if origin else u''
+    src_str = u'''<tr>
         <td class="seghead midrow">Src:</td>
         <td class="midrow src">{}</td>
-       </tr>'''.format(src.encode('u8')) if src else ''
-    cand_str = ''.join(ops2html(styled_cand, seg_id))
-    ref_str = ''.join(ops2html(styled_ref, seg_id))
-    return '''
+       </tr>'''.format(src) if src else u''
+    cand_str = u''.join(ops2html(styled_cand, seg_id))
+    ref_str = u''.join(ops2html(styled_ref, seg_id))
+    return u'''
 <tr>
   <td class="mainrow">{origin_str}{seg_id}</td>
   <td class="mainrow score">
@@ -534,7 +537,7 @@ def html_dump(out_file, aligned_segs, styled_ops, seg_scores, doc_cost, doc_div)
     styled_ops are the decorated operations as returned by compare_segments().
     seg_scores are the pairs (cost, div) as returned by score_all().
     """
-    print >> out_file, '''<!DOCTYPE html>
+    print(u'''<!DOCTYPE html>
 <html lang="en">
 <head>
   <meta charset="utf-8">
@@ -582,7 +585,7 @@ def html_dump(out_file, aligned_segs, styled_ops, seg_scores, doc_cost, doc_div)
       <span class="trg ins">Insertion</span>
       <span class="trg shift">Shift</span>
     </th>
-</tr>'''
+</tr>''', file=out_file)
     prev_id = None
     for segs, ops, score_pair in zip(aligned_segs, styled_ops, seg_scores):
         if prev_id:
@@ -593,21 +596,21 @@ def html_dump(out_file, aligned_segs, styled_ops, seg_scores, doc_cost, doc_div)
                 # Some seg ids contain letters, just ignore
                 skipped = None
             if skipped:
-                print >> out_file, '''
+                print(u'''
 <tr>
   <td class="detail" title="Mismatch - {} seg. skipped">[...]</td>
-</tr>'''.format(skipped)
+</tr>'''.format(skipped), file=out_file)
 
         prev_id = segs[0]
-        print >> out_file, segs2html(segs, ops, score_pair)
-    print >> out_file, '''
+        print(segs2html(segs, ops, score_pair), file=out_file)
+    print(u'''
 <tr>
   <th>Total</th>
   <th class="score"><span class="detail">{:.0f}/{:.0f}=</span><br/>{:.0%}</th>
   <th></th>
-</tr>'''.format(doc_cost, doc_div, (1.*doc_cost/doc_div) if doc_div else 0)
+</tr>'''.format(doc_cost, doc_div, (1.*doc_cost/doc_div) if doc_div else 0), file=out_file)
 
-    print >> out_file, '</table></html>'
+    print(u'</table></html>', file=out_file)
 
 
 def format_score(cost, div, verbose):
@@ -634,26 +637,26 @@ def run_on(aligned_segs, args):
     seg_scores = list(score_all(aligned_segs, styled_ops, args.alt_norm))
     if args.verbose > 1:
         for index, (cost, div) in enumerate(seg_scores):
-            print "charCUT of sentence {} is {:.4f} ({}/{})".format(index, 1. * cost/div if div != 0 else 0.,cost,div)
+            print("charCUT of sentence {} is {:.4f} ({}/{})".format(index, 1. * cost/div if div != 0 else 0.,cost,div))
 
     doc_cost = sum(cost for cost, _ in seg_scores)
     doc_div = sum(div for _, div in seg_scores)
 
-    print format_score(doc_cost, doc_div, args.verbose)
+    print(format_score(doc_cost, doc_div, args.verbose))
 
     if getattr(args, 'plain_output_file', None):
         with open(args.plain_output_file, 'w') as plain_file:
             for pair in seg_scores:
-                print >> plain_file, format_score(*pair)
+                print(format_score(*pair), file=plain_file)
 
     if getattr(args, 'html_output_file', None):
-        with open(args.html_output_file, 'w') as html_file:
+        with codecs.open(args.html_output_file, 'w', 'utf-8') as html_file:
             html_dump(html_file, aligned_segs, styled_ops, seg_scores, doc_cost, doc_div)
 
     if getattr(args, 'con_output_file', None):
         with open(args.con_output_file, 'w') as con_file:
             for (seg_id, orig, src, cand, ref), (cand_ops, ref_ops) in zip(aligned_segs, styled_ops):
-                print >> con_file, repr((cand_ops, ref_ops, cand, ref))
+                print(repr((cand_ops, ref_ops, cand, ref)), file=con_file)
 
     return (1. * doc_cost / doc_div) if doc_div else 0.
 
@@ -664,7 +667,7 @@ def tokenization_international(line):
 
     # if raw bytes than convert them into Unicode characters
     is_input_rawbytes = False
-    if type(norm_text) is str:
+    if isinstance(norm_text, bytes):
         norm_text = norm_text.decode('utf-8')
         is_input_rawbytes = True
 
@@ -674,11 +677,11 @@ def tokenization_international(line):
     # (1) temporarily remove and store XML tags
     #
     # the re for the tag name only
-    tag_name_rx = '([a-zA-Z_:])([a-zA-Z0-9_\.-:])*'
+    tag_name_rx = r'([a-zA-Z_:])([a-zA-Z0-9_\.-:])*'
     # the re for the full tag (5 cases)
-    full_tag_rx  = '(<(%s)[^>]*\/?>)' % tag_name_rx
-    full_tag_rx  += '|(<!(%s)[^>]*[^\/]>)' % tag_name_rx
-    full_tag_rx  += '|(<\/(%s)[^>]*>)' % tag_name_rx
+    full_tag_rx  = r'(<(%s)[^>]*\/?>)' % tag_name_rx
+    full_tag_rx  += r'|(<!(%s)[^>]*[^\/]>)' % tag_name_rx
+    full_tag_rx  += r'|(<\/(%s)[^>]*>)' % tag_name_rx
     full_tag_rx  += '|(<!--)|(-->)'
     p = re.compile(full_tag_rx, flags=re.U)
     tagList = []
@@ -724,13 +727,13 @@ def tokenization_international(line):
     # (4) restore numbers with punctuation inside
     #
     for i in range(0, len(numList)):
-        norm_text = re.sub('MTEVALNUMBERWITHPUNCT%d' % i, numList[i], norm_text, 1,
+        norm_text = re.sub('MTEVALNUMBERWITHPUNCT%d' % i, numList[i], norm_text, count=1,
                            flags=re.U)
 
     # (5) restore tags
     #
     for i in range(0, len(tagList)):
-        norm_text = re.sub('MTEVALXMLTAG%d' % i, tagList[i], norm_text, 1,
+        norm_text = re.sub('MTEVALXMLTAG%d' % i, tagList[i], norm_text, count=1,
                            flags=re.U)
 
     # (6) remove useless spaces
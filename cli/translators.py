@@ -1,4 +1,5 @@
-import Queue
+from __future__ import print_function
+
 import copy
 import os
 import random
@@ -10,6 +11,11 @@ from xml.etree import ElementTree
 
 import requests
 
+try:
+    import queue
+except ImportError:  # Python 2
+    import Queue as queue
+
 from cli.libs import nvidia_smi
 from cli.mmt.cluster import ApiException, ClusterNode
 from cli.mmt.processing import XMLEncoder
@@ -43,7 +49,7 @@ class TranslateEngine(object):
 
     def translate_batch(self, generator, consumer, threads=None):
         pool = Pool(threads if threads is not None else self._get_default_threads())
-        jobs = Queue.Queue()
+        jobs = queue.Queue()
 
         raise_error = []
 
@@ -82,17 +88,17 @@ class TranslateEngine(object):
     def translate_stream(self, input_stream, output_stream, threads=None):
         def generator():
             for line in input_stream:
-                yield line.rstrip('\n')
+                yield line.rstrip(b'\n')
 
         def consumer(line):
             output_stream.write(line.encode('utf-8'))
-            output_stream.write('\n')
+            output_stream.write(b'\n')
 
         return self.translate_batch(generator(), consumer, threads=threads)
 
     def translate_file(self, input_file, output_file, threads=None):
-        with open(input_file) as input_stream:
-            with open(output_file, 'w') as output_stream:
+        with open(input_file, 'rb') as input_stream:
+            with open(output_file, 'wb') as output_stream:
                 return self.translate_stream(input_stream, output_stream, threads=threads)
 
     def translate_corpora(self, corpora, output_folder, threads=None):
@@ -156,7 +162,8 @@ class MMTTranslator(TranslateEngine):
 
     def translate_text(self, text):
         try:
-            text = text.decode('utf-8')
+            if isinstance(text, bytes):
+                text = text.decode('utf-8')
 
             if len(text) > 4096:
                 text = text[:4096]
@@ -167,7 +174,7 @@ class MMTTranslator(TranslateEngine):
             raise TranslateError('Unable to connect to MMT. '
                                  'Please check if engine is running on port %d.' % self._api.port)
         except ApiException as e:
-            raise TranslateError(e.message)
+            raise TranslateError(str(e))
 
         return translation['translation']
 
@@ -179,7 +186,7 @@ class MMTTranslator(TranslateEngine):
             raise TranslateError('Unable to connect to MMT. '
                                  'Please check if engine is running on port %d.' % self._api.port)
         except ApiException as e:
-            raise TranslateError(e.message)
+            raise TranslateError(str(e))
         finally:
             self._context = None
 
@@ -311,17 +318,17 @@ class InteractiveTranslator(Translator):
     def __init__(self, engine):
         Translator.__init__(self, engine)
 
-        print '\nModernMT Translate command line'
+        print('\nModernMT Translate command line')
 
         if isinstance(engine, MMTTranslator) and engine.context_vector:
             norm = sum([e['score'] for e in engine.context_vector])
-            print '>> Context:', ', '.join(
+            print('>> Context:', ', '.join(
                 ['%s %.f%%' % (self._memory_to_string(score['memory']), round(score['score'] * 100 / norm))
-                 for score in engine.context_vector])
+                 for score in engine.context_vector]))
         else:
-            print '>> No context provided.'
+            print('>> No context provided.')
 
-        print
+        print()
 
     @staticmethod
     def _memory_to_string(memory):
@@ -333,7 +340,7 @@ class InteractiveTranslator(Translator):
     def run(self, in_stream, out_stream, threads=None):
         try:
             while 1:
-                out_stream.write('> ')
+                out_stream.write(b'> ')
                 line = in_stream.readline()
                 if not line:
                     break
@@ -344,7 +351,7 @@ class InteractiveTranslator(Translator):
 
                 translation = self._engine.translate_text(line)
                 out_stream.write(translation.encode('utf-8'))
-                out_stream.write('\n')
+                out_stream.write(b'\n')
                 out_stream.flush()
         except KeyboardInterrupt:
             pass
@@ -408,7 +415,7 @@ class XLIFFTranslator(Translator):
         self._units = None
         self._index = None
 
-        for namespace, uri in self.NAMESPACES.iteritems():
+        for namespace, uri in self.NAMESPACES.items():
             if namespace == 'xlf':
                 namespace = ''
             ElementTree.register_namespace(namespace, uri)
@@ -474,7 +481,7 @@ class XLIFFTranslator(Translator):
             return el, placeholders
 
         content, _placeholders = _navigate(copy.deepcopy(element), [])
-        content = ElementTree.tostring(content, encoding='utf-8', method='xml')
+        content = ElementTree.tostring(content, encoding='utf-8', method='xml').decode('utf-8')
         content = content[content.find('>') + 1:]
         content = content[:content.rfind('</%s>' % XLIFFTranslator._get_tag_name(element))]
         return (content, _placeholders) if len(content) > 0 else (None, None)
@@ -491,7 +498,7 @@ class XLIFFTranslator(Translator):
         content = ElementTree.fromstring(content.encode('utf-8'))
 
         # Replace placeholders
-        parent_map = dict((c, p) for p in content.getiterator() for c in p)
+        parent_map = dict((c, p) for p in content.iter() for c in p)
 
         for i, source in enumerate(placeholders):
             target = content.find('.//%s[@id="%d"]' % (source.tag, i + 1))
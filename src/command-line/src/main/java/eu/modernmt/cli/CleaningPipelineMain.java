@@ -3,6 +3,7 @@ package eu.modernmt.cli;
 import eu.modernmt.cleaning.CorporaCleaning;
 import eu.modernmt.cli.log4j.Log4jConfiguration;
 import eu.modernmt.cli.utils.FileFormat;
+import eu.modernmt.cli.utils.InputRoots;
 import eu.modernmt.facade.ModernMT;
 import eu.modernmt.lang.Language;
 import eu.modernmt.lang.LanguagePair;
@@ -15,6 +16,7 @@ import org.apache.commons.io.FileUtils;
 import org.apache.logging.log4j.Level;
 
 import java.io.File;
+import java.io.IOException;
 import java.util.List;
 
 /**
@@ -33,7 +35,8 @@ public class CleaningPipelineMain {
         static {
             Option sourceLanguage = Option.builder("s").hasArg().required().build();
             Option targetLanguage = Option.builder("t").hasArg().build();
-            Option inputPath = Option.builder().longOpt("input").hasArgs().required().build();
+            Option inputPath = Option.builder().longOpt("input").hasArgs().build();
+            Option inputList = Option.builder().longOpt("input-list").hasArg().build();
             Option outputPath = Option.builder().longOpt("output").hasArg().required().build();
             Option outputFormat = Option.builder().longOpt("output-format").hasArgs().build();
             Option filters = Option.builder().longOpt("filters").hasArgs().build();
@@ -42,6 +45,7 @@ public class CleaningPipelineMain {
             cliOptions.addOption(sourceLanguage);
             cliOptions.addOption(targetLanguage);
             cliOptions.addOption(inputPath);
+            cliOptions.addOption(inputList);
             cliOptions.addOption(outputPath);
             cliOptions.addOption(outputFormat);
             cliOptions.addOption(filters);
@@ -54,17 +58,14 @@ public class CleaningPipelineMain {
         public final FileFormat outputFormat;
         public final Filter[] filters;
 
-        public Args(String[] args) throws ParseException {
+        public Args(String[] args) throws ParseException, IOException {
             CommandLineParser parser = new DefaultParser();
             CommandLine cli = parser.parse(cliOptions, args);
 
             source = Language.fromString(cli.getOptionValue('s'));
             target = cli.hasOption('t') ? Language.fromString(cli.getOptionValue('t')) : null;
 
-            String[] roots = cli.getOptionValues("input");
-            inputRoots = new File[roots.length];
-            for (int i = 0; i < roots.length; i++)
-                inputRoots[i] = new File(roots[i]);
+            inputRoots = InputRoots.parse(cli);
 
             outputRoot = new File(cli.getOptionValue("output"));
             outputFormat = cli.hasOption("output-format") ? FileFormat.fromName(cli.getOptionValue("output-format")) : null;
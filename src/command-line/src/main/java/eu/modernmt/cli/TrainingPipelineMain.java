@@ -1,6 +1,7 @@
 package eu.modernmt.cli;
 
 import eu.modernmt.cli.log4j.Log4jConfiguration;
+import eu.modernmt.cli.utils.InputRoots;
 import eu.modernmt.facade.ModernMT;
 import eu.modernmt.facade.TrainingFacade;
 import eu.modernmt.lang.Language;
@@ -11,6 +12,7 @@ import org.apache.commons.cli.*;
 import org.apache.logging.log4j.Level;
 
 import java.io.File;
+import java.io.IOException;
 import java.util.List;
 
 /**
@@ -25,7 +27,8 @@ public class TrainingPipelineMain {
         static {
             Option sourceLanguage = Option.builder("s").hasArg().required().build();
             Option targetLanguage = Option.builder("t").hasArg().required().build();
-            Option inputPath = Option.builder().longOpt("input").hasArgs().required().build();
+            Option inputPath = Option.builder().longOpt("input").hasArgs().build();
+            Option inputList = Option.builder().longOpt("input-list").hasArg().build();
             Option outputPath = Option.builder().longOpt("output").hasArg().required().build();
             Option devPath = Option.builder().longOpt("dev").hasArg().required(false).build();
             Option testPath = Option.builder().longOpt("test").hasArg().required(false).build();
@@ -35,6 +38,7 @@ public class TrainingPipelineMain {
             cliOptions.addOption(sourceLanguage);
             cliOptions.addOption(targetLanguage);
             cliOptions.addOption(inputPath);
+            cliOptions.addOption(inputList);
             cliOptions.addOption(outputPath);
             cliOptions.addOption(devPath);
             cliOptions.addOption(testPath);
@@ -48,7 +52,7 @@ public class TrainingPipelineMain {
         public final File testRoot;
         public final int partitionSize;
 
-        public Args(String[] args) throws ParseException {
+        public Args(String[] args) throws ParseException, IOException {
             CommandLineParser parser = new DefaultParser();
             CommandLine cli = parser.parse(cliOptions, args);
 
@@ -56,10 +60,7 @@ public class TrainingPipelineMain {
             Language targetLanguage = Language.fromString(cli.getOptionValue('t'));
             language = new LanguagePair(sourceLanguage, targetLanguage);
 
-            String[] roots = cli.getOptionValues("input");
-            inputRoots = new File[roots.length];
-            for (int i = 0; i < roots.length; i++)
-                inputRoots[i] = new File(roots[i]);
+            inputRoots = InputRoots.parse(cli);
 
             outputRoot = new File(cli.getOptionValue("output"));
 
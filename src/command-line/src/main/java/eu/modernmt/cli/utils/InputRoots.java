@@ -0,0 +1,37 @@
+package eu.modernmt.cli.utils;
+
+import org.apache.commons.cli.CommandLine;
+import org.apache.commons.cli.ParseException;
+import org.apache.commons.io.FileUtils;
+
+import java.io.File;
+import java.io.IOException;
+import java.util.List;
+
+public class InputRoots {
+
+    /**
+     * Reads the input roots of a command, either from the "--input-list" file
+     * (one root per line: keeps the command line short with many roots) or from
+     * the "--input" option values.
+     */
+    public static File[] parse(CommandLine cli) throws ParseException, IOException {
+        String[] roots;
+        if (cli.hasOption("input-list")) {
+            List<String> lines = FileUtils.readLines(new File(cli.getOptionValue("input-list")), "UTF-8");
+            lines.removeIf(String::isEmpty);
+            roots = lines.toArray(new String[lines.size()]);
+        } else if (cli.hasOption("input")) {
+            roots = cli.getOptionValues("input");
+        } else {
+            throw new ParseException("Missing required option: input");
+        }
+
+        File[] files = new File[roots.length];
+        for (int i = 0; i < roots.length; i++)
+            files[i] = new File(roots[i]);
+
+        return files;
+    }
+
+}